@@ -5,30 +5,61 @@ Sort, score, and organise tournament footage fast.
 """
 
 import argparse
+import bisect
 import glob
+import hashlib
 import json
+import math
 import os
+import platform
 import subprocess
 import sys
 import tempfile
+import time
 import wave
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 
 try:
     import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
 except ImportError:
     print("Error: numpy is required. Run: pip install numpy")
     sys.exit(1)
 
+try:
+    import av  # Optional: in-process container probing (pip install av)
+except ImportError:
+    av = None
+
+try:
+    import orjson  # Optional: fast JSON serialisation for the report (pip install orjson)
+except ImportError:
+    orjson = None
+
+try:
+    import numpy_rms  # Optional: SIMD windowed RMS (pip install numpy-rms)
+except ImportError:
+    numpy_rms = None
+
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
 SUPPORTED_EXTENSIONS = {".mov", ".mp4", ".m4v", ".avi", ".mkv", ".mts", ".webm"}
+SUPPORTED_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)  # For a single str.endswith check
 SCRUB_FRAMES = 12  # Frames in sprite sheet (plenty for 5-30s clips)
 SPRITE_FRAME_W = 240  # Small and fast
 SPRITE_FRAME_H = 135  # 16:9
+AUDIO_SAMPLE_RATE = 8000  # Crowd loudness lives well below 4kHz; half the samples of 16kHz
+FAST_BATCH_SIZE = 16  # Max clips per ffmpeg process in --fast triage
+SCORE_THRESHOLDS = (0.03, 0.08, 0.15, 0.25)  # Combined-loudness cutoffs between scores 1..5
+TRIAGE_SAVE_EVERY = 10  # Triaged clips between triage_data.json checkpoints
+TRIAGE_SAVE_SECS = 2.0  # ...or seconds, whichever comes first
+AUDIO_BLOCK_WINDOWS = 256  # 100ms windows read per block (~25s, ~800KB of PCM)
+PROGRESS_FLUSH_SECS = 0.25  # How often Phase 2 progress lines are flushed to the terminal
+_SYSTEM = platform.system()
 
 
 # ---------------------------------------------------------------------------
@@ -45,59 +76,140 @@ def check_ffmpeg():
             sys.exit(1)
 
 
+_hwaccel = []  # ffmpeg -hwaccel input args, set once by detect_hwaccel()
+
+
+def detect_hwaccel():
+    """Enable hardware video decode if this machine can actually open the device."""
+    global _hwaccel
+    if _SYSTEM == "Darwin":
+        candidate = "videotoolbox"
+    else:
+        # -hwaccels only lists what ffmpeg was built with, not what the machine has
+        try:
+            listed = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-hwaccels"], capture_output=True, text=True,
+            ).stdout.split()
+        except OSError:
+            listed = []
+        if "cuda" not in listed:
+            return
+        candidate = "cuda"
+    probe = subprocess.run(
+        ["ffmpeg", "-v", "quiet", "-init_hw_device", candidate,
+         "-f", "lavfi", "-i", "nullsrc=s=16x16", "-frames:v", "1", "-f", "null", "-"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    if probe.returncode == 0:
+        _hwaccel = ["-hwaccel", candidate]
+
+
+def run_video_ffmpeg(clip_path: str, output_args: list[str], input_args: tuple = ()) -> subprocess.CompletedProcess:
+    """Run an ffmpeg video decode of clip_path, hardware-accelerated when possible."""
+    result = subprocess.run(
+        ["ffmpeg", "-y", *input_args, *_hwaccel, "-i", clip_path, *output_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    if result.returncode != 0 and _hwaccel:
+        # Some clips won't decode on the hardware path — retry this one in software
+        result = subprocess.run(
+            ["ffmpeg", "-y", *input_args, "-i", clip_path, *output_args],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    return result
+
+
+def _probe_with_av(clip_path: str) -> dict:
+    """Read clip info by parsing the container in-process with PyAV."""
+    width, height = 0, 0
+    has_audio = False
+    with av.open(clip_path) as container:
+        for stream in container.streams:
+            if stream.type == "video" and not width:
+                width = stream.codec_context.width
+                height = stream.codec_context.height
+            elif stream.type == "audio":
+                has_audio = True
+        duration = container.duration / av.time_base if container.duration else 0.0
+
+    return {
+        "duration": duration,
+        "size_bytes": os.path.getsize(clip_path),
+        "width": width,
+        "height": height,
+        "has_audio": has_audio,
+    }
+
+
 def get_clip_info(clip_path: str) -> dict:
     """Return clip duration and basic info."""
+    if av is not None:
+        try:
+            return _probe_with_av(clip_path)
+        except Exception:
+            pass  # Container PyAV can't parse — let ffprobe have a go
+
     result = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", clip_path],
+        [
+            "ffprobe", "-v", "quiet", "-print_format", "json",
+            "-show_entries", "format=duration,size:stream=codec_type,width,height",
+            clip_path,
+        ],
         capture_output=True, text=True,
     )
     info = json.loads(result.stdout)
     duration = float(info.get("format", {}).get("duration", 0))
     size_bytes = int(info.get("format", {}).get("size", 0))
 
-    # Get video dimensions
+    # Get video dimensions, and note whether there is any audio to triage
     width, height = 0, 0
+    has_audio = False
     for stream in info.get("streams", []):
-        if stream.get("codec_type") == "video":
+        codec_type = stream.get("codec_type")
+        if codec_type == "video" and not width:
             width = stream.get("width", 0)
             height = stream.get("height", 0)
-            break
+        elif codec_type == "audio":
+            has_audio = True
 
     return {
         "duration": duration,
         "size_bytes": size_bytes,
         "width": width,
         "height": height,
+        "has_audio": has_audio,
     }
 
 
-def extract_audio_pcm(clip_path: str, tmp_dir: str) -> str | None:
-    """Extract audio as 16-bit mono WAV. Returns path or None on failure."""
-    out_path = os.path.join(tmp_dir, "audio.wav")
-    result = subprocess.run(
-        [
-            "ffmpeg", "-y", "-i", clip_path,
-            "-vn", "-ac", "1", "-ar", "16000", "-sample_fmt", "s16",
+def extract_audio_batch(clip_paths: list[str], tmp_dir: str) -> list[str | None] | None:
+    """Extract audio for several clips with one ffmpeg process; None if the whole batch failed."""
+    cmd = ["ffmpeg", "-y"]
+    for clip_path in clip_paths:
+        cmd += ["-threads", "1", "-i", clip_path]
+
+    out_paths = []
+    for i in range(len(clip_paths)):
+        out_path = os.path.join(tmp_dir, f"audio_{i:03d}.wav")
+        cmd += [
+            "-map", f"{i}:a:0",
+            "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE), "-sample_fmt", "s16",
             "-f", "wav", out_path,
-        ],
-        capture_output=True,
-    )
-    if result.returncode != 0 or not os.path.exists(out_path):
+        ]
+        out_paths.append(out_path)
+
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if result.returncode != 0:
         return None
-    return out_path
+    return [p if os.path.exists(p) else None for p in out_paths]
 
 
 def extract_poster(clip_path: str, output_path: str, duration: float):
     """Extract a single poster frame from 25% into the clip."""
     t = max(duration * 0.25, 0.1)
-    subprocess.run(
-        [
-            "ffmpeg", "-y", "-ss", f"{t:.2f}", "-i", clip_path,
-            "-vframes", "1", "-q:v", "4",
-            "-vf", "scale=640:-1",
-            output_path,
-        ],
-        capture_output=True,
+    run_video_ffmpeg(
+        clip_path,
+        ["-vframes", "1", "-q:v", "4", "-vf", "scale=640:-1", output_path],
+        input_args=("-ss", f"{t:.2f}"),
     )
 
 
@@ -110,12 +222,12 @@ def generate_sprite_sheet(clip_path: str, output_path: str, duration: float, num
     # All in one ffmpeg call — no temp files, no multi-pass
     fps = max(num_frames / duration, 0.5)
 
-    result = subprocess.run(
+    result = run_video_ffmpeg(
+        clip_path,
         [
-            "ffmpeg", "-y", "-i", clip_path,
             "-vf", (
                 f"fps={fps:.4f},"
-                f"scale={SPRITE_FRAME_W}:{SPRITE_FRAME_H}:force_original_aspect_ratio=decrease,"
+                f"scale={SPRITE_FRAME_W}:{SPRITE_FRAME_H}:force_original_aspect_ratio=decrease:flags=fast_bilinear,"
                 f"pad={SPRITE_FRAME_W}:{SPRITE_FRAME_H}:(ow-iw)/2:(oh-ih)/2:color=black,"
                 f"tile={num_frames}x1"
             ),
@@ -123,7 +235,6 @@ def generate_sprite_sheet(clip_path: str, output_path: str, duration: float, num
             "-q:v", "7",
             output_path,
         ],
-        capture_output=True,
     )
 
     if result.returncode == 0 and os.path.exists(output_path):
@@ -139,166 +250,490 @@ def generate_sprite_sheet(clip_path: str, output_path: str, duration: float, num
     return None
 
 
+def generate_previews(clip_path: str, poster_path: str, sprite_path: str, duration: float,
+                      num_frames: int = SCRUB_FRAMES) -> dict | None:
+    """Generate poster frame and sprite sheet from one decode pass of the clip."""
+    # Outputs are judged by existence below, so clear any left by an earlier run
+    for path in (poster_path, sprite_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    if duration <= 0:
+        extract_poster(clip_path, poster_path, duration)
+        return None
+
+    fps = max(num_frames / duration, 0.5)
+    t = max(duration * 0.25, 0.1)
+
+    result = run_video_ffmpeg(
+        clip_path,
+        [
+            "-filter_complex", (
+                f"[0:v]split=2[s][p];"
+                f"[s]fps={fps:.4f},"
+                f"scale={SPRITE_FRAME_W}:{SPRITE_FRAME_H}:force_original_aspect_ratio=decrease:flags=fast_bilinear,"
+                f"pad={SPRITE_FRAME_W}:{SPRITE_FRAME_H}:(ow-iw)/2:(oh-ih)/2:color=black,"
+                f"tile={num_frames}x1[sprite];"
+                f"[p]trim=start={t:.2f},scale=640:-1[poster]"
+            ),
+            "-map", "[sprite]", "-frames:v", "1", "-q:v", "7", sprite_path,
+            "-map", "[poster]", "-frames:v", "1", "-q:v", "4", poster_path,
+        ],
+    )
+
+    if result.returncode != 0 or not os.path.exists(sprite_path):
+        # Fall back to the separate calls (e.g. exotic streams split can't handle)
+        if not os.path.exists(poster_path):
+            extract_poster(clip_path, poster_path, duration)
+        return generate_sprite_sheet(clip_path, sprite_path, duration, num_frames)
+
+    if not os.path.exists(poster_path):
+        # Poster timestamp past the last decodable frame — seek for it instead
+        extract_poster(clip_path, poster_path, duration)
+
+    return {
+        "path": sprite_path,
+        "frame_count": min(num_frames, max(1, int(duration * fps))),
+        "frame_width": SPRITE_FRAME_W,
+        "frame_height": SPRITE_FRAME_H,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Audio analysis
 # ---------------------------------------------------------------------------
 
-def analyse_audio(wav_path: str) -> dict:
-    """Analyse a WAV file and return audio metrics."""
-    with wave.open(wav_path, "rb") as wf:
-        n_frames = wf.getnframes()
-        if n_frames == 0:
-            return {"rms": 0, "peak": 0, "dynamic_range": 0, "peak_window_rms": 0}
-        raw = wf.readframes(n_frames)
-
-    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float64) / 32768.0
-
-    rms = float(np.sqrt(np.mean(samples ** 2)))
-    peak = float(np.max(np.abs(samples)))
-
-    window_size = 1600  # 100ms at 16kHz
-    if len(samples) > window_size:
-        n_windows = len(samples) // window_size
-        windowed = samples[:n_windows * window_size].reshape(n_windows, window_size)
-        window_rms = np.sqrt(np.mean(windowed ** 2, axis=1))
-        dynamic_range = float(np.max(window_rms) - np.min(window_rms))
-        peak_window_rms = float(np.max(window_rms))
+def analyse_pcm(read_samples, hop_size: int | None = None) -> dict:
+    """Analyse mono s16 PCM (read_samples(n) -> up to n samples as bytes), 100ms windows every hop_size samples."""
+    window_size = AUDIO_SAMPLE_RATE // 10  # 100ms
+    hop_size = hop_size or window_size
+    overlapping = hop_size != window_size
+    use_numpy_rms = numpy_rms is not None and not overlapping  # numpy-rms has no hop
+
+    n_samples = 0
+    total_sq = 0
+    peak = 0
+    max_window_rms = 0.0
+    min_window_rms = math.inf
+    float_buf = np.empty(window_size * AUDIO_BLOCK_WINDOWS, dtype=np.float32) if use_numpy_rms else None
+    carry = np.empty(0, dtype=np.int16)  # Samples not yet covered by a whole window
+
+    while True:
+        raw = read_samples(window_size * AUDIO_BLOCK_WINDOWS)
+        if not raw:
+            break
+
+        samples = np.frombuffer(raw, dtype=np.int16)
+        n_samples += samples.size
+        # max/min rather than abs — abs(-32768) overflows int16
+        peak = max(peak, int(samples.max()), -int(samples.min()))
+
+        # Reads are whole blocks of windows (short only at the end), so with
+        # the default hop there is never a carry to join and no copy here.
+        stream = np.concatenate((carry, samples)) if carry.size else samples
+        n_windows = (stream.size - window_size) // hop_size + 1 if stream.size >= window_size else 0
+        carry = stream[n_windows * hop_size:]
+
+        if overlapping:
+            # Overlapping windows double-count samples, so the total comes
+            # from the new samples. einsum sums int16 squares straight into
+            # int64, exactly, without materialising a squared copy.
+            total_sq += int(np.einsum("i,i->", samples, samples, dtype=np.int64))
+        if n_windows == 0:
+            continue
+
+        if use_numpy_rms:
+            # numpy-rms wants float32: convert into the reused buffer, then
+            # recover the block's energy from the window RMS values rather
+            # than making a second pass over the samples.
+            block = float_buf[:n_windows * window_size]
+            np.copyto(block, stream[:n_windows * window_size])
+            window_rms = numpy_rms.rms(block, window_size=window_size)
+            total_sq += float(np.dot(window_rms.astype(np.float64), window_rms)) * window_size
+            max_window_rms = max(max_window_rms, float(window_rms.max()) / 32768.0)
+            min_window_rms = min(min_window_rms, float(window_rms.min()) / 32768.0)
+        else:
+            # Strided view of every window — no copy, whatever the hop.
+            # One pass gives per-window sums of squares; back-to-back, their
+            # total is the block's energy. Only the extreme windows need a sqrt.
+            windowed = sliding_window_view(stream, window_size)[::hop_size][:n_windows]
+            window_sq = np.einsum("ij,ij->i", windowed, windowed, dtype=np.int64)
+            if not overlapping:
+                total_sq += int(window_sq.sum())
+            max_window_rms = max(max_window_rms, math.sqrt(int(window_sq.max()) / window_size) / 32768.0)
+            min_window_rms = min(min_window_rms, math.sqrt(int(window_sq.min()) / window_size) / 32768.0)
+
+    # The final partial window is dropped from the windowed stats, but its
+    # samples still count towards the overall RMS.
+    if not overlapping:
+        total_sq += int(np.einsum("i,i->", carry, carry, dtype=np.int64))
+
+    if n_samples == 0:
+        return {"rms": 0, "peak": 0, "dynamic_range": 0, "peak_window_rms": 0}
+
+    rms = math.sqrt(total_sq / n_samples) / 32768.0
+
+    if n_samples > window_size:
+        dynamic_range = max_window_rms - min_window_rms
+        peak_window_rms = max_window_rms
     else:
         dynamic_range = 0
         peak_window_rms = rms
 
     return {
         "rms": rms,
-        "peak": peak,
+        "peak": peak / 32768.0,
         "dynamic_range": dynamic_range,
         "peak_window_rms": peak_window_rms,
+        "hop_size": hop_size,
     }
 
 
-def score_excitement(metrics: dict) -> int:
-    """Convert audio metrics to a 1-5 excitement score."""
-    combined = (
+def analyse_audio(wav_path: str, hop_size: int | None = None) -> dict:
+    """Analyse a 16-bit mono WAV at AUDIO_SAMPLE_RATE and return audio metrics."""
+    with wave.open(wav_path, "rb") as wf:
+        return analyse_pcm(wf.readframes, hop_size)
+
+
+def analyse_clip_audio(clip_path: str, hop_size: int | None = None) -> dict | None:
+    """Decode a clip's audio through an ffmpeg pipe and analyse it as it streams (None on failure)."""
+    proc = subprocess.Popen(
+        [
+            # Triage runs one ffmpeg per worker process; keep each single-threaded
+            "ffmpeg", "-v", "quiet", "-threads", "1", "-i", clip_path,
+            "-vn", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE), "-f", "s16le", "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    with proc:
+        metrics = analyse_pcm(lambda n: proc.stdout.read(n * 2), hop_size)
+    if proc.returncode != 0:
+        return None
+    return metrics
+
+
+def _combined_excitement(metrics: dict) -> float:
+    return (
         metrics.get("peak_window_rms", 0) * 0.5
         + metrics.get("dynamic_range", 0) * 0.3
         + metrics.get("rms", 0) * 0.2
     )
 
-    if combined > 0.25:
-        return 5
-    elif combined > 0.15:
-        return 4
-    elif combined > 0.08:
-        return 3
-    elif combined > 0.03:
-        return 2
-    else:
-        return 1
+
+def score_excitement(metrics: dict) -> int:
+    """Convert audio metrics to a 1-5 excitement score."""
+    # Scores 1-5 are the number of thresholds strictly below combined, plus one
+    return bisect.bisect_left(SCORE_THRESHOLDS, _combined_excitement(metrics)) + 1
+
+
+def score_excitement_batch(metrics_list: list[dict]) -> list[int]:
+    """Vectorised score_excitement for many clips: one searchsorted over all of them."""
+    combined = np.fromiter(map(_combined_excitement, metrics_list), dtype=np.float64,
+                           count=len(metrics_list))
+    return (np.searchsorted(SCORE_THRESHOLDS, combined) + 1).tolist()
 
 
 # ---------------------------------------------------------------------------
 # Clip discovery
 # ---------------------------------------------------------------------------
 
+def _scan_dir(path: str):
+    """Yield supported clips under path, recursing via os.scandir."""
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return  # Unreadable directory — skip it, as os.walk would
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_dir(entry.path)
+            elif not entry.name.startswith(".") and entry.name.lower().endswith(SUPPORTED_SUFFIXES):
+                yield entry.path
+
+
 def find_clips(input_dir: str) -> list[str]:
     """Find all supported video clips in directory (recursive)."""
-    clips = []
-    for root, _, files in os.walk(input_dir):
-        for f in sorted(files):
-            if Path(f).suffix.lower() in SUPPORTED_EXTENSIONS and not f.startswith("."):
-                clips.append(os.path.join(root, f))
-    return clips
+    return sorted(_scan_dir(input_dir))
 
 
 # ---------------------------------------------------------------------------
 # Phase 1: Quick scan — generate HTML immediately
 # ---------------------------------------------------------------------------
 
-def quick_scan(clips: list[str], output_dir: str) -> list[dict]:
-    """Quick scan: get durations, generate sprite sheets for instant scrubbing."""
-    results = []
-    sprites_dir = os.path.join(output_dir, "sprites")
-    posters_dir = os.path.join(output_dir, "posters")
-    os.makedirs(sprites_dir, exist_ok=True)
-    os.makedirs(posters_dir, exist_ok=True)
+def clip_fingerprint(clip_path: str) -> str | None:
+    """Cheap identity for a clip's current contents: path + mtime + size (None if unreadable)."""
+    try:
+        st = os.stat(clip_path)
+    except OSError:
+        return None  # Dangling symlink, or deleted since discovery
+    return f"{os.path.abspath(clip_path)}:{st.st_mtime_ns}:{st.st_size}"
 
-    for i, clip_path in enumerate(clips, 1):
-        clip_name = os.path.basename(clip_path)
-        clip_stem = Path(clip_path).stem
-        print(f"  [{i}/{len(clips)}] {clip_name}", end="", flush=True)
 
-        try:
-            info = get_clip_info(clip_path)
-        except Exception:
-            info = {"duration": 0, "size_bytes": 0, "width": 0, "height": 0}
-
-        result = {
-            "filename": clip_name,
-            "path": os.path.abspath(clip_path),
-            "duration": info["duration"],
-            "size_bytes": info["size_bytes"],
-            "width": info["width"],
-            "height": info["height"],
-            "score": 0,
-            "audio_metrics": {},
-            "poster": None,
-            "sprite": None,
-            "sprite_frames": 0,
-            "sprite_frame_width": 0,
-            "sprite_frame_height": 0,
-        }
+def _scan_cache_path(output_dir: str, fingerprint: str) -> str:
+    digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+    return os.path.join(output_dir, ".cache", f"{digest}.json")
 
-        # Generate poster
-        poster_path = os.path.join(posters_dir, f"{clip_stem}.jpg")
-        extract_poster(clip_path, poster_path, info["duration"])
-        if os.path.exists(poster_path):
-            result["poster"] = os.path.relpath(poster_path, output_dir)
-
-        # Generate sprite sheet
-        sprite_path = os.path.join(sprites_dir, f"{clip_stem}.jpg")
-        sprite_info = generate_sprite_sheet(clip_path, sprite_path, info["duration"])
-        if sprite_info:
-            result["sprite"] = os.path.relpath(sprite_info["path"], output_dir)
-            result["sprite_frames"] = sprite_info["frame_count"]
-            result["sprite_frame_width"] = sprite_info["frame_width"]
-            result["sprite_frame_height"] = sprite_info["frame_height"]
-            print(f"  ✓ {info['duration']:.1f}s")
-        else:
-            print(f"  ✓")
 
-        results.append(result)
+def load_cached_scan(output_dir: str, fingerprint: str) -> dict | None:
+    """Return the cached scan result for a clip, if its previews are still on disk."""
+    cache_path = _scan_cache_path(output_dir, fingerprint)
+    try:
+        with open(cache_path) as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    for key in ("poster", "sprite"):
+        if result.get(key) and not os.path.exists(os.path.join(output_dir, result[key])):
+            return None
+    return result
+
+
+def save_cached_scan(output_dir: str, fingerprint: str, result: dict):
+    """Persist a clip's scan result so re-runs can skip ffprobe/ffmpeg."""
+    cache_path = _scan_cache_path(output_dir, fingerprint)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(result, f)
+
+
+def _safe_get_clip_info(clip_path: str) -> dict:
+    try:
+        return get_clip_info(clip_path)
+    except Exception:
+        return {"duration": 0, "size_bytes": 0, "width": 0, "height": 0, "has_audio": True}
+
+
+def scan_clip(clip_path: str, output_dir: str, force: bool = False) -> tuple[dict, str]:
+    """Probe one clip and build its poster + sprite sheet; returns (result, progress status)."""
+    clip_stem = Path(clip_path).stem
+
+    fingerprint = clip_fingerprint(clip_path)
+    cached = None if force or fingerprint is None else load_cached_scan(output_dir, fingerprint)
+    if cached:
+        return cached, "cached"
+
+    info = _safe_get_clip_info(clip_path)
+
+    result = {
+        "filename": os.path.basename(clip_path),
+        "path": os.path.abspath(clip_path),
+        "duration": info["duration"],
+        "size_bytes": info["size_bytes"],
+        "width": info["width"],
+        "height": info["height"],
+        "has_audio": info["has_audio"],
+        "fingerprint": fingerprint,
+        "score": 0,
+        "audio_metrics": {},
+        "poster": None,
+        "sprite": None,
+        "sprite_frames": 0,
+        "sprite_frame_width": 0,
+        "sprite_frame_height": 0,
+    }
+
+    # Generate poster + sprite sheet in one pass
+    poster_path = os.path.join(output_dir, "posters", f"{clip_stem}.jpg")
+    sprite_path = os.path.join(output_dir, "sprites", f"{clip_stem}.jpg")
+    sprite_info = generate_previews(clip_path, poster_path, sprite_path, info["duration"])
+    if os.path.exists(poster_path):
+        result["poster"] = os.path.relpath(poster_path, output_dir)
+
+    status = ""
+    if sprite_info:
+        result["sprite"] = os.path.relpath(sprite_info["path"], output_dir)
+        result["sprite_frames"] = sprite_info["frame_count"]
+        result["sprite_frame_width"] = sprite_info["frame_width"]
+        result["sprite_frame_height"] = sprite_info["frame_height"]
+        status = f"{info['duration']:.1f}s"
+
+    # Only cache clean probes — a failed ffprobe should be retried next run
+    if info["duration"] > 0 and fingerprint:
+        save_cached_scan(output_dir, fingerprint, result)
+    return result, status
+
+
+def quick_scan(clips: list[str], output_dir: str, force: bool = False,
+               workers: int | None = None) -> list[dict]:
+    """Quick scan: get durations, generate sprite sheets for instant scrubbing."""
+    os.makedirs(os.path.join(output_dir, "sprites"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "posters"), exist_ok=True)
+
+    by_path = {}
+    # Each task runs a multithreaded ffmpeg decode, so one per core, not
+    # ThreadPoolExecutor's I/O-sized default
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+        futures = {ex.submit(scan_clip, clip_path, output_dir, force): clip_path for clip_path in clips}
+        for i, future in enumerate(as_completed(futures), 1):
+            clip_path = futures[future]
+            result, status = future.result()
+            by_path[clip_path] = result
+            print(f"  [{i}/{len(clips)}] {result['filename']}  ✓ {status}".rstrip())
 
     print(f"\n  Scanned {len(clips)} clips with sprite sheets.")
-    return results
+    # Back to input order so the report's default order stays deterministic
+    return [by_path[clip_path] for clip_path in clips]
 
 
 # ---------------------------------------------------------------------------
 # Phase 2: Audio triage
 # ---------------------------------------------------------------------------
 
-def run_triage(clips: list[dict], output_dir: str):
-    """Run audio analysis on all clips and update scores."""
-    data_path = os.path.join(output_dir, "triage_data.json")
+def _score(metrics: dict | None) -> dict:
+    if metrics is None:
+        return {"score": 1, "audio_metrics": {}}
+    return {"score": score_excitement(metrics), "audio_metrics": metrics}
 
-    for i, clip in enumerate(clips, 1):
-        clip_name = clip["filename"]
-        print(f"  [{i}/{len(clips)}] {clip_name}", end="", flush=True)
-
-        # Audio analysis
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            wav_path = extract_audio_pcm(clip["path"], tmp_dir)
-            if wav_path:
-                metrics = analyse_audio(wav_path)
-                clip["audio_metrics"] = metrics
-                clip["score"] = score_excitement(metrics)
-            else:
-                clip["score"] = 1
 
-        stars = "★" * clip["score"] + "☆" * (5 - clip["score"])
-        print(f"  →  {stars}")
+def triage_clip(clip_path: str, has_audio: bool = True, hop_size: int | None = None) -> dict:
+    """Score one clip from its audio. Top-level so it pickles into worker processes."""
+    # No audio stream in the probe — nothing to extract
+    if not has_audio:
+        return {"score": 1, "audio_metrics": {}}
+    return _score(analyse_clip_audio(clip_path, hop_size))
+
+
+def triage_batch(clip_paths: list[str], hop_size: int | None = None) -> list[dict]:
+    """Score a batch of clips (all with audio) from a single ffmpeg run (--fast)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wav_paths = extract_audio_batch(clip_paths, tmp_dir)
+        if wav_paths is None:
+            # One bad input sinks the whole command — redo this batch clip by clip
+            return [triage_clip(p, hop_size=hop_size) for p in clip_paths]
+        metrics = [analyse_audio(p, hop_size) if p else None for p in wav_paths]
+    scored = [m for m in metrics if m is not None]
+    scores = iter(score_excitement_batch(scored))
+    return [{"score": next(scores), "audio_metrics": m} if m is not None else _score(None)
+            for m in metrics]
+
+
+def load_triage_data(data_path: str) -> dict:
+    """Load a previous run's triage_data.json as {fingerprint: clip}."""
+    try:
+        with open(data_path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {c["fingerprint"]: c for c in previous if c.get("fingerprint")}
+
+
+def write_triage_data(clips: list[dict], data_path: str):
+    """Atomically replace triage_data.json, so a crash mid-write never corrupts the cache."""
+    tmp_path = data_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(clips, f, indent=2)
+    os.replace(tmp_path, data_path)
+
 
-        # Write progress to JSON after each clip
-        with open(data_path, "w") as f:
-            json.dump(clips, f, indent=2)
+def reset_triage_feed(output_dir: str):
+    """Empty triage_data.ndjson, so a freshly opened report never polls a previous run's feed."""
+    open(os.path.join(output_dir, "triage_data.ndjson"), "w").close()
+
+
+def _reusable_triage(cached: dict | None, hop_size: int | None) -> bool:
+    if not cached or cached.get("score", 0) <= 0:
+        return False
+    metrics = cached.get("audio_metrics") or {}
+    if not metrics:
+        # No metrics despite an audio stream means analysis failed — retry it
+        return not cached.get("has_audio", True)
+    # Scores from a different window hop aren't comparable
+    window_size = AUDIO_SAMPLE_RATE // 10
+    return metrics.get("hop_size", window_size) == (hop_size or window_size)
+
+
+def append_triage_feed(feed, clip: dict):
+    """Append one scored clip to triage_data.ndjson, the report's incremental poll feed."""
+    feed.write(json.dumps({"filename": clip["filename"], "score": clip["score"],
+                           "audio_metrics": clip.get("audio_metrics", {})}) + "\n")
+    feed.flush()
+
+
+def _print_triaged(done: int, total: int, clip: dict, note: str = ""):
+    stars = "★" * clip["score"] + "☆" * (5 - clip["score"])
+    print(f"  [{done}/{total}] {clip['filename']}  →  {stars}{note}")
+
+
+def run_triage(clips: list[dict], output_dir: str, workers: int | None = None, fast: bool = False,
+               force: bool = False, hop_size: int | None = None):
+    """Run audio analysis on all clips in parallel and update scores (reusing cached ones unless force)."""
+    data_path = os.path.join(output_dir, "triage_data.json")
+    previous = {} if force else load_triage_data(data_path)
+
+    # Appends: main() resets the feed before the report that polls it is written
+    with open(os.path.join(output_dir, "triage_data.ndjson"), "a") as feed:
+        done = 0
+        pending = []
+        for clip in clips:
+            clip["fingerprint"] = clip.get("fingerprint") or clip_fingerprint(clip["path"])
+            cached = previous.get(clip["fingerprint"])
+            if _reusable_triage(cached, hop_size):
+                clip["score"] = cached["score"]
+                clip["audio_metrics"] = cached.get("audio_metrics", {})
+                done += 1
+                append_triage_feed(feed, clip)
+                _print_triaged(done, len(clips), clip, "  (cached)")
+            else:
+                pending.append(clip)
+
+        saved, saved_at = done, time.monotonic()
+        flushed_at = saved_at
+        # Cap batches so every worker gets one, even on small folders
+        n_batched = sum(1 for clip in pending if clip.get("has_audio", True))
+        batch_size = max(1, min(FAST_BATCH_SIZE, math.ceil(n_batched / (workers or os.cpu_count()))))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {}
+            batch = []
+            for clip in pending:
+                has_audio = clip.get("has_audio", True)
+                if fast and has_audio:
+                    batch.append(clip)
+                    if len(batch) == batch_size:
+                        futures[ex.submit(triage_batch, [c["path"] for c in batch], hop_size)] = batch
+                        batch = []
+                else:
+                    futures[ex.submit(triage_clip, clip["path"], has_audio, hop_size)] = [clip]
+            if batch:
+                futures[ex.submit(triage_batch, [c["path"] for c in batch], hop_size)] = batch
+
+            # Wake at least every PROGRESS_FLUSH_SECS, so the tail of a burst
+            # of completions is flushed without waiting for the next clip
+            not_done = set(futures)
+            while not_done:
+                finished, not_done = wait(not_done, timeout=PROGRESS_FLUSH_SECS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    group = futures[future]
+                    try:
+                        outcome = future.result()
+                    except Exception:
+                        outcome = _score(None)
+                    outcomes = outcome if isinstance(outcome, list) else [outcome] * len(group)
+
+                    for clip, result in zip(group, outcomes):
+                        clip.update(result)
+                        done += 1
+                        append_triage_feed(feed, clip)
+                        _print_triaged(done, len(clips), clip)
+
+                    # Re-serialising every clip after each completion is O(N²) over
+                    # the run, so checkpoint every TRIAGE_SAVE_EVERY clips, or every
+                    # TRIAGE_SAVE_SECS if clips are slow, so an interrupted run loses little
+                    if done - saved >= TRIAGE_SAVE_EVERY or time.monotonic() - saved_at >= TRIAGE_SAVE_SECS:
+                        write_triage_data(clips, data_path)
+                        saved, saved_at = done, time.monotonic()
+
+                # main() block-buffers stdout for this phase; push progress
+                # out a few times a second rather than once per clip
+                if not finished or time.monotonic() - flushed_at >= PROGRESS_FLUSH_SECS:
+                    sys.stdout.flush()
+                    flushed_at = time.monotonic()
+
+    # Final write — also covers runs where every clip came from the cache
+    write_triage_data(clips, data_path)
 
     return clips
 
@@ -307,12 +742,76 @@ def run_triage(clips: list[dict], output_dir: str):
 # HTML report generation
 # ---------------------------------------------------------------------------
 
-def generate_report(clips: list[dict], output_dir: str, input_dir: str) -> str:
-    """Generate the HTML report with hover-scrub, manual ratings, and grid controls."""
+# Bracket the embedded clip data so a later update can splice in new JSON
+CLIPS_START = "/*CLIPS*/"
+CLIPS_END = "/*END_CLIPS*/"
 
-    clips_json = json.dumps(clips, indent=2)
 
-    html = f"""<!DOCTYPE html>
+def _clips_json(clips: list[dict]) -> str:
+    # Compact JSON: the browser's JSON.parse doesn't need the whitespace
+    if orjson is not None:
+        return orjson.dumps(clips).decode()
+    return json.dumps(clips, separators=(",", ":"))
+
+
+def _topbar_stats(clips: list[dict]) -> dict:
+    # Topbar aggregates, rendered server-side so the stats are right before the
+    # page's JS runs (it still recomputes them to fold in manual ratings)
+    durations = np.fromiter((c["duration"] for c in clips), dtype=np.float64, count=len(clips))
+    scores = np.fromiter((c["score"] for c in clips), dtype=np.int8, count=len(clips))
+    return {
+        "stat-hot": str(int((scores >= 4).sum()) or "-"),
+        "stat-skip": str(int(((scores >= 1) & (scores <= 2)).sum()) or "-"),
+        "stat-duration": f"{durations.sum() / 60:.0f}m",
+    }
+
+
+def _write_report(report_path: str, parts: list[str]):
+    # Replace atomically, so reloading the page mid-write never shows a truncated report
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(parts)
+    os.replace(tmp_path, report_path)
+
+
+def update_report_data(clips: list[dict], report_path: str) -> bool:
+    """Swap fresh clip data and topbar stats into an existing report. False if it has no data markers."""
+    try:
+        with open(report_path) as f:
+            html = f.read()
+    except OSError:
+        return False
+    start = html.find(CLIPS_START)
+    end = html.find(CLIPS_END, start)
+    if start < 0 or end < 0:
+        return False
+
+    # The stat spans all sit in the page head, before the clip data
+    head = html[:start + len(CLIPS_START)]
+    for stat_id, value in _topbar_stats(clips).items():
+        marker = f'id="{stat_id}">'
+        i = head.find(marker)
+        if i >= 0:
+            i += len(marker)
+            head = head[:i] + value + head[head.index("<", i):]
+
+    _write_report(report_path, [head, _clips_json(clips), html[end:]])
+    return True
+
+
+def generate_report(clips: list[dict], output_dir: str, input_dir: str, update_only: bool = False) -> str:
+    """Generate the HTML report; with update_only, just refresh an existing report's data."""
+    report_path = os.path.join(output_dir, "index.html")
+    if update_only and update_report_data(clips, report_path):
+        return report_path
+
+    clips_json = _clips_json(clips)
+    stats = _topbar_stats(clips)
+
+    # Assemble the page as parts and write them out directly, so the (large)
+    # clip JSON is never copied into one giant interpolated string.
+    parts = []
+    parts.append(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
@@ -346,7 +845,7 @@ def generate_report(clips: list[dict], output_dir: str, input_dir: str) -> str:
     .grid {{ display: grid; gap: 12px; }}
 
     /* Clip card */
-    .clip {{ background: #1e293b; border-radius: 10px; overflow: hidden; transition: transform 0.1s; position: relative; }}
+    .clip {{ background: #1e293b; border-radius: 10px; overflow: hidden; transition: transform 0.1s; position: relative; content-visibility: auto; contain-intrinsic-size: auto none auto 300px; }}
     .clip:hover {{ transform: scale(1.01); }}
     .clip.hidden {{ display: none; }}
 
@@ -401,9 +900,9 @@ def generate_report(clips: list[dict], output_dir: str, input_dir: str) -> str:
     <h1>🏀 HoopTriage</h1>
     <div class="stats">
         <span><span class="num" id="stat-total">{len(clips)}</span> clips</span>
-        <span><span class="num" id="stat-hot">-</span> hot</span>
-        <span><span class="num" id="stat-skip">-</span> skip</span>
-        <span><span class="num" id="stat-duration">{sum(c['duration'] for c in clips) / 60:.0f}m</span> footage</span>
+        <span><span class="num" id="stat-hot">{stats['stat-hot']}</span> hot</span>
+        <span><span class="num" id="stat-skip">{stats['stat-skip']}</span> skip</span>
+        <span><span class="num" id="stat-duration">{stats['stat-duration']}</span> footage</span>
         <span id="triage-progress"></span>
     </div>
     <div class="controls">
@@ -442,7 +941,9 @@ def generate_report(clips: list[dict], output_dir: str, input_dir: str) -> str:
 // ---------------------------------------------------------------------------
 // Data
 // ---------------------------------------------------------------------------
-const CLIPS = {clips_json};
+const CLIPS = {CLIPS_START}""")
+    parts.append(clips_json)
+    parts.append(f"""{CLIPS_END};
 const manualRatings = JSON.parse(localStorage.getItem('hooptriage_ratings') || '{{}}');
 
 // Apply any saved manual ratings
@@ -474,10 +975,8 @@ gridEl.style.gridTemplateColumns = gridSizes[sizeSlider.value];
 // ---------------------------------------------------------------------------
 // Render clips
 // ---------------------------------------------------------------------------
-function renderClips() {{
-    gridEl.innerHTML = '';
-
-    // Sort
+// Clips in display order: sorted, then filtered
+function visibleClips() {{
     const sortBy = document.getElementById('sort-by').value;
     const sorted = [...CLIPS].sort((a, b) => {{
         switch(sortBy) {{
@@ -489,48 +988,51 @@ function renderClips() {{
             case 'duration-asc': return a.duration - b.duration;
         }}
     }});
+    return sorted.filter(clip =>
+        (filterScore === 'all' || String(clip.score) === filterScore) &&
+        (filterType !== 'manual' || clip.manual));
+}}
 
-    sorted.forEach((clip, idx) => {{
-        // Filter
-        if (filterScore !== 'all' && String(clip.score) !== filterScore) return;
-        if (filterType === 'manual' && !clip.manual) return;
-
-        const card = document.createElement('div');
-        card.className = 'clip';
-        card.dataset.idx = idx;
-        card.dataset.filename = clip.filename;
-
-        const scoreClass = clip.score > 0 ? `score-${{clip.score}}` : 'score-0';
-        const stars = renderStars(clip.score, clip.manual);
-        const dur = formatDuration(clip.duration);
-        const triageLabel = clip.score === 0 ? '<span class="triage-status">⏳ pending</span>' : '<span class="triage-status done"></span>';
-        const posterSrc = clip.poster ? clip.poster : '';
-        const posterImg = posterSrc ? `<img class="poster" src="${{posterSrc}}" alt="">` : '';
-        const spriteSrc = clip.sprite ? clip.sprite : '';
-        const spriteFrames = clip.sprite_frames || 0;
-        const spriteFrameH = clip.sprite_frame_height || 180;
-
-        card.innerHTML = `
-            <div class="vid-wrap" data-path="${{clip.path}}" data-duration="${{clip.duration}}"
-                 data-sprite="${{spriteSrc}}" data-sprite-frames="${{spriteFrames}}" data-sprite-frame-h="${{spriteFrameH}}">
-                ${{posterImg}}
-                <div class="sprite-layer"></div>
-                <div class="scrub-bar"></div>
-                <div class="time-indicator">0:00</div>
-                ${{triageLabel}}
+function buildCard(clip, idx) {{
+    const card = document.createElement('div');
+    card.className = 'clip';
+    card.dataset.idx = idx;
+    card.dataset.filename = clip.filename;
+
+    const scoreClass = clip.score > 0 ? `score-${{clip.score}}` : 'score-0';
+    const stars = renderStars(clip.score, clip.manual);
+    const dur = formatDuration(clip.duration);
+    const triageLabel = clip.score === 0 ? '<span class="triage-status">⏳ pending</span>' : '<span class="triage-status done"></span>';
+    const posterSrc = clip.poster ? clip.poster : '';
+    const posterImg = posterSrc ? `<img class="poster" src="${{posterSrc}}" alt="">` : '';
+    const spriteSrc = clip.sprite ? clip.sprite : '';
+    const spriteFrames = clip.sprite_frames || 0;
+    const spriteFrameH = clip.sprite_frame_height || 180;
+
+    card.innerHTML = `
+        <div class="vid-wrap" data-path="${{clip.path}}" data-duration="${{clip.duration}}"
+             data-sprite="${{spriteSrc}}" data-sprite-frames="${{spriteFrames}}" data-sprite-frame-h="${{spriteFrameH}}">
+            ${{posterImg}}
+            <div class="sprite-layer"></div>
+            <div class="scrub-bar"></div>
+            <div class="time-indicator">0:00</div>
+            ${{triageLabel}}
+        </div>
+        <div class="clip-info">
+            <span class="clip-name" title="${{clip.filename}}">${{clip.filename}}</span>
+            <div class="clip-meta">
+                <span class="duration">${{dur}}</span>
+                <span class="stars ${{clip.manual ? 'manual' : ''}}" data-filename="${{clip.filename}}">${{stars}}</span>
+                <span class="score-badge ${{scoreClass}}">${{clip.score || '?'}}</span>
             </div>
-            <div class="clip-info">
-                <span class="clip-name" title="${{clip.filename}}">${{clip.filename}}</span>
-                <div class="clip-meta">
-                    <span class="duration">${{dur}}</span>
-                    <span class="stars ${{clip.manual ? 'manual' : ''}}" data-filename="${{clip.filename}}">${{stars}}</span>
-                    <span class="score-badge ${{scoreClass}}">${{clip.score || '?'}}</span>
-                </div>
-            </div>
-        `;
+        </div>
+    `;
+    return card;
+}}
 
-        gridEl.appendChild(card);
-    }});
+function renderClips() {{
+    gridEl.innerHTML = '';
+    visibleClips().forEach((clip, idx) => gridEl.appendChild(buildCard(clip, idx)));
 
     // Attach events
     attachScrubEvents();
@@ -570,18 +1072,30 @@ function updateStats() {{
 // ---------------------------------------------------------------------------
 // Hover scrub (sprite-sheet based — instant, no video decoding)
 // ---------------------------------------------------------------------------
-function attachScrubEvents() {{
-    document.querySelectorAll('.vid-wrap').forEach(wrap => {{
+// Rect of the card being scrubbed, read once per hover rather than per
+// mousemove (getBoundingClientRect forces layout). Scrolling or resizing
+// moves the card, so drop it and let the next mousemove re-read it.
+let scrubRect = null;
+const invalidateScrubRect = () => {{ scrubRect = null; }};
+window.addEventListener('scroll', invalidateScrubRect, {{ passive: true, capture: true }});
+window.addEventListener('resize', invalidateScrubRect, {{ passive: true }});
+
+function attachScrubEvents(root = document) {{
+    root.querySelectorAll('.vid-wrap').forEach(wrap => {{
         const spriteSrc = wrap.dataset.sprite;
         const spriteFrames = parseInt(wrap.dataset.spriteFrames) || 0;
         const spriteFrameH = parseInt(wrap.dataset.spriteFrameH) || 180;
+        const duration = parseFloat(wrap.dataset.duration) || 0;
         const spriteLayer = wrap.querySelector('.sprite-layer');
+        const scrubBar = wrap.querySelector('.scrub-bar');
+        const timeIndicator = wrap.querySelector('.time-indicator');
         let spriteLoaded = false;
 
         if (spriteSrc && spriteFrames > 0) {{
             // Preload sprite on hover
             wrap.addEventListener('mouseenter', () => {{
                 if (wrap.closest('.expanded')) return;
+                scrubRect = wrap.getBoundingClientRect();
                 if (!spriteLoaded) {{
                     spriteLayer.style.backgroundImage = `url(${{spriteSrc}})`;
                     // Horizontal sprite: total width = frames * frame_width
@@ -593,9 +1107,8 @@ function attachScrubEvents() {{
 
             wrap.addEventListener('mousemove', (e) => {{
                 if (wrap.closest('.expanded')) return;
-                const rect = wrap.getBoundingClientRect();
-                const pct = Math.max(0, Math.min(1, (e.clientX - rect.left) / rect.width));
-                const duration = parseFloat(wrap.dataset.duration) || 0;
+                if (!scrubRect) scrubRect = wrap.getBoundingClientRect();
+                const pct = Math.max(0, Math.min(1, (e.clientX - scrubRect.left) / scrubRect.width));
                 const time = pct * duration;
 
                 // Pick frame index
@@ -607,23 +1120,24 @@ function attachScrubEvents() {{
                 spriteLayer.style.opacity = '1';
 
                 // Scrub bar
-                wrap.querySelector('.scrub-bar').style.width = (pct * 100) + '%';
+                scrubBar.style.width = (pct * 100) + '%';
 
                 // Time indicator
                 const mins = Math.floor(time / 60);
                 const secs = Math.floor(time % 60);
-                wrap.querySelector('.time-indicator').textContent = `${{mins}}:${{String(secs).padStart(2, '0')}}`;
+                timeIndicator.textContent = `${{mins}}:${{String(secs).padStart(2, '0')}}`;
             }});
 
             wrap.addEventListener('mouseleave', () => {{
                 if (wrap.closest('.expanded')) return;
-                wrap.querySelector('.scrub-bar').style.width = '0';
+                scrubBar.style.width = '0';
                 spriteLayer.style.opacity = '0';
             }});
         }}
 
         // Double-click to expand and play with full video
         wrap.addEventListener('dblclick', () => {{
+            scrubRect = null;  // Card changes size either way
             const card = wrap.closest('.clip');
             let video = wrap.querySelector('video');
 
@@ -649,8 +1163,8 @@ function attachScrubEvents() {{
 // ---------------------------------------------------------------------------
 // Clickable star ratings
 // ---------------------------------------------------------------------------
-function attachStarEvents() {{
-    document.querySelectorAll('.stars').forEach(starsEl => {{
+function attachStarEvents(root = document) {{
+    root.querySelectorAll('.stars').forEach(starsEl => {{
         starsEl.querySelectorAll('.star').forEach(star => {{
             star.addEventListener('click', (e) => {{
                 e.stopPropagation();
@@ -712,23 +1226,102 @@ document.getElementById('sort-by').addEventListener('change', renderClips);
 // Polling for triage updates
 // ---------------------------------------------------------------------------
 let pollInterval = null;
+const clipsByName = new Map(CLIPS.map(c => [c.filename, c]));
+
+// Update a rendered card's score in place, keeping hover/scrub state intact
+function patchCard(clip) {{
+    const card = gridEl.querySelector(`.clip[data-filename="${{CSS.escape(clip.filename)}}"]`);
+    if (!card) return;
+    const badge = card.querySelector('.score-badge');
+    badge.textContent = clip.score;
+    badge.className = `score-badge score-${{clip.score}}`;
+    card.querySelectorAll('.stars .star').forEach(s => {{
+        s.classList.toggle('filled', parseInt(s.dataset.value) <= clip.score);
+    }});
+    card.querySelector('.triage-status').className = 'triage-status done';
+}}
+
+// Move, add or drop just the changed clips' cards so the grid matches the
+// current sort and filter, leaving every other card (and any hover) untouched
+function placeCards(changed) {{
+    const changedSet = new Set(changed);
+    const cards = new Map([...gridEl.children].map(el => [el.dataset.filename, el]));
+    const order = visibleClips();
+    const visible = new Set(order);
+    changed.forEach(clip => {{
+        const card = cards.get(clip.filename);
+        if (card && !visible.has(clip)) card.remove();
+    }});
+    // Walk backwards so each changed card is inserted before its successor
+    let next = null;
+    for (let i = order.length - 1; i >= 0; i--) {{
+        const clip = order[i];
+        let card = cards.get(clip.filename);
+        if (changedSet.has(clip)) {{
+            if (!card) {{
+                card = buildCard(clip, i);
+                attachScrubEvents(card);
+                attachStarEvents(card);
+            }}
+            if (!card.parentNode || card.nextElementSibling !== next) gridEl.insertBefore(card, next);
+        }}
+        if (card) next = card;
+    }}
+}}
+
+// Read only what run_triage has appended to triage_data.ndjson since the last
+// poll. Servers that honour Range send just the new bytes (206); otherwise
+// (200) the whole file comes back and is sliced locally.
+let feedOffset = 0;
+
+function fetchFeed() {{
+    return fetch('triage_data.ndjson?t=' + Date.now(), {{ headers: {{ Range: `bytes=${{feedOffset}}-` }} }})
+        .then(r => {{
+            if (r.status === 416) {{
+                // Range starts at or past the end: nothing new, unless the
+                // feed was restarted by a new run and is now shorter
+                const size = parseInt((r.headers.get('Content-Range') || '').split('/')[1]);
+                if (size >= feedOffset) return [];
+                feedOffset = 0;
+                return fetchFeed();
+            }}
+            return r.ok ? r.arrayBuffer().then(buf => {{
+                let bytes = new Uint8Array(buf);
+                if (r.status !== 206) {{
+                    if (bytes.length < feedOffset) feedOffset = 0;  // Feed restarted by a new run
+                    bytes = bytes.subarray(feedOffset);
+                }}
+                // Only consume whole lines; a partial last line is re-read next poll
+                const end = bytes.lastIndexOf(10) + 1;
+                const data = [];
+                new TextDecoder().decode(bytes.subarray(0, end)).split('\\n').forEach(line => {{
+                    if (!line) return;
+                    try {{ data.push(JSON.parse(line)); }} catch (e) {{}}  // Skip a bad line, keep the rest
+                }});
+                feedOffset += end;
+                return data;
+            }}) : null;
+        }});
+}}
 
 function pollTriageData() {{
-    fetch('triage_data.json?t=' + Date.now())
-        .then(r => r.ok ? r.json() : null)
+    fetchFeed()
         .then(data => {{
             if (!data) return;
-            let changed = false;
+            const changed = [];
             data.forEach(d => {{
-                const clip = CLIPS.find(c => c.filename === d.filename);
+                const clip = clipsByName.get(d.filename);
                 if (clip && !clip.manual && d.score > 0 && clip.score === 0) {{
                     clip.score = d.score;
                     clip.audio_metrics = d.audio_metrics;
-                    clip.poster = d.poster;
-                    changed = true;
+                    changed.push(clip);
                 }}
             }});
-            if (changed) renderClips();
+            if (changed.length) {{
+                changed.forEach(patchCard);
+                placeCards(changed);
+                updateStats();
+            }}
 
             // Stop polling when all done
             if (CLIPS.every(c => c.score > 0)) {{
@@ -767,11 +1360,9 @@ document.addEventListener('keydown', (e) => {{
 renderClips();
 </script>
 </body>
-</html>"""
+</html>""")
 
-    report_path = os.path.join(output_dir, "index.html")
-    with open(report_path, "w") as f:
-        f.write(html)
+    _write_report(report_path, parts)
 
     return report_path
 
@@ -780,6 +1371,20 @@ renderClips();
 # Main
 # ---------------------------------------------------------------------------
 
+# Opener for the finished report, picked once for this OS
+if _SYSTEM == "Darwin":
+    def _open_report(path: str):
+        subprocess.Popen(["open", path])
+elif _SYSTEM == "Windows":
+    _open_report = os.startfile
+else:
+    def _open_report(path: str):
+        try:
+            subprocess.Popen(["xdg-open", path], stderr=subprocess.DEVNULL)
+        except OSError:
+            pass  # No desktop opener (e.g. headless box) — the path is printed anyway
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="🏀 HoopTriage — Sort, score, and organise basketball clips fast.",
@@ -790,6 +1395,10 @@ def main():
     parser.add_argument("--min-score", type=int, default=0, help="Only include clips with score >= N in report")
     parser.add_argument("--scan-only", action="store_true", help="Quick scan only — skip audio triage (instant report)")
     parser.add_argument("--triage-only", action="store_true", help="Run triage on already-scanned clips")
+    parser.add_argument("--fast", action="store_true", help="Batch several clips per ffmpeg process during triage (best for many short clips)")
+    parser.add_argument("--force", action="store_true", help="Re-process every clip, ignoring cached scan and triage results")
+    parser.add_argument("--overlap", action="store_true", help="Score audio with 50%%-overlapping windows (finer peak detection, slightly slower)")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="Clips to scan and triage in parallel (default: CPU count)")
 
     args = parser.parse_args()
 
@@ -817,6 +1426,7 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
 
     check_ffmpeg()
+    detect_hwaccel()
 
     print(f"🏀 HoopTriage")
     print(f"   Input:   {input_dir}")
@@ -830,22 +1440,17 @@ def main():
 
     # Phase 1: Quick scan + sprite sheets
     print(f"Phase 1: Scanning {len(clips)} clips + generating sprite sheets...")
-    results = quick_scan(clips, output_dir)
+    results = quick_scan(clips, output_dir, args.force, args.workers)
 
     # Generate report immediately (browsable before triage finishes)
     print(f"\nGenerating report...")
+    reset_triage_feed(output_dir)
     report_path = generate_report(results, output_dir, input_dir)
-    print(f"   Report ready: {report_path}")
-    print(f"   Open it now:  open \"{report_path}\"\n")
+    sys.stdout.write(f"   Report ready: {report_path}\n"
+                     f"   Open it now:  open \"{report_path}\"\n\n")
 
     # Auto-open report in browser
-    import platform
-    if platform.system() == "Darwin":
-        subprocess.Popen(["open", report_path])
-    elif platform.system() == "Windows":
-        os.startfile(report_path)
-    else:
-        subprocess.Popen(["xdg-open", report_path], stderr=subprocess.DEVNULL)
+    _open_report(report_path)
 
     if args.scan_only:
         print("Scan complete. Run with --triage-only to add audio scores later.")
@@ -853,22 +1458,46 @@ def main():
 
     # Phase 2: Audio triage
     print(f"Phase 2: Audio triage (scores will update in the report as they complete)...")
-    results = run_triage(results, output_dir)
-
-    # Regenerate final report with all scores
-    generate_report(results, output_dir, input_dir)
-
-    # Summary
-    scores = [r["score"] for r in results if r["score"] > 0]
-    print(f"\n{'='*50}")
-    print(f"🏀 HoopTriage Complete!")
-    print(f"{'='*50}")
-    print(f"   Clips analysed:  {len(results)}")
-    print(f"   Hot clips (4-5): {len([s for s in scores if s >= 4])}")
-    print(f"   Medium (3):      {len([s for s in scores if s == 3])}")
-    print(f"   Likely skip (≤2): {len([s for s in scores if s <= 2])}")
-    print(f"\n   Report: {report_path}")
-    print(f"   Open it:  open \"{report_path}\"")
+    # One progress line per clip; let run_triage batch the flushes instead of
+    # a write per line, then put stdout back for the summary
+    line_buffering = getattr(sys.stdout, "line_buffering", False)
+    if line_buffering:
+        sys.stdout.reconfigure(line_buffering=False)
+    try:
+        results = run_triage(results, output_dir, args.workers, args.fast, args.force,
+                             AUDIO_SAMPLE_RATE // 20 if args.overlap else None)
+    finally:
+        if line_buffering:
+            sys.stdout.reconfigure(line_buffering=True)
+
+    # Swap the final scores into the report in the background, and
+    # print the summary while it renders
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        report_future = ex.submit(generate_report, results, output_dir, input_dir, update_only=True)
+
+        # Summary — built up front and written in one go
+        hot = med = skip = 0
+        for r in results:
+            s = r.get("score", 0)
+            if s >= 4:
+                hot += 1
+            elif s == 3:
+                med += 1
+            elif s > 0:
+                skip += 1
+        sys.stdout.write("\n".join([
+            f"\n{'='*50}",
+            f"🏀 HoopTriage Complete!",
+            f"{'='*50}",
+            f"   Clips analysed:  {len(results)}",
+            f"   Hot clips (4-5): {hot}",
+            f"   Medium (3):      {med}",
+            f"   Likely skip (≤2): {skip}",
+            f"\n   Report: {report_path}",
+            f"   Open it:  open \"{report_path}\"",
+        ]) + "\n")
+        sys.stdout.flush()
+        report_future.result()
 
 
 if __name__ == "__main__":